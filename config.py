@@ -2,4 +2,4 @@ class Config:
     MAX_GRID_SIZE = 50
     MAX_CELLS = 10
     MAX_ITERATIONS = 2000
-    
\ No newline at end of file
+    OFFSPRING_SIZE = 1
@@ -1,7 +1,9 @@
+import math
 import random
 from grid import Grid
-from game_of_life import GameOfLife
 from grid_builder import GridBuilder
+from packed_grid import PackedGrid
+from lifespan import LifespanSimulation
 from config import Config
 from typing import List
 from ga_statistics import GeneticAlgorithmStatistics
@@ -12,15 +14,17 @@ class GridFitnessCalculator:
     Attributes
     ----------
     cache : dict
-        A class-level cache to store previously calculated fitness values.
+        A class-level cache of the (possibly partial) lifespan simulation of every packed grid seen so far.
     Methods
     -------
     getStatistics():
         Returns the best candidate, maximum fitness, maximum generation, and maximum size statistics.
-    is_stable_or_oscillating(grid: Grid, history: List[Grid]) -> bool:
-        Determines if the given grid is stable or oscillating based on its history.
-    calculate(grid: Grid) -> float:
-        Calculates the fitness of the given grid. Uses a cache to store and retrieve previously calculated values.
+    simulation(bits: int) -> LifespanSimulation:
+        Returns the cached simulation of the given packed grid, creating it if needed.
+    evaluate(bits: int, horizon: int) -> float:
+        Advances the simulation of the given packed grid up to the horizon and returns its fitness.
+    calculate(bits: int) -> float:
+        Calculates the fitness of the given packed grid with the full Config.MAX_ITERATIONS horizon.
     """
     
     cache = {}
@@ -30,48 +34,67 @@ class GridFitnessCalculator:
         return GridFitnessCalculator.best_candidate, GridFitnessCalculator.max_fitness, GridFitnessCalculator.max_gen, GridFitnessCalculator.max_size
 
     @staticmethod
-    def is_stable_or_oscillating(grid: Grid, history: List[Grid]):
-        return len(history) > 2 and grid in history
+    def simulation(bits: int):
+        if bits not in GridFitnessCalculator.cache:
+            GridFitnessCalculator.cache[bits] = LifespanSimulation(bits)
+        return GridFitnessCalculator.cache[bits]
 
     @staticmethod
-    def calculate(grid: Grid):
-        grid_hash = hash(str(grid))
+    def evaluate(bits: int, horizon: int):
+        simulation = GridFitnessCalculator.simulation(bits)
+        simulation.advance(horizon)
 
-        if grid_hash in GridFitnessCalculator.cache:
-            cached_grid, fitness, gen, max_size, stable_or_oscillating = GridFitnessCalculator.cache[grid_hash]
-            
-            if stable_or_oscillating:
-                return fitness
-            
-            grid_cpy = cached_grid
-            history = []
-        else:
-            grid_cpy = grid.copy()
-            history = []
-            gen = 0
-            max_size = 0
-            fitness = 1
-            stable_or_oscillating = False
-        
-        history.append(grid_cpy.copy())
-        while gen < Config.MAX_ITERATIONS:
-            if GridFitnessCalculator.is_stable_or_oscillating(grid_cpy, history):
-                stable_or_oscillating = True
-                break
-            
-            if len(grid_cpy) > max_size:
-                max_size = len(grid_cpy)
-                GeneticAlgorithmStatistics.set_stat("max_size", lambda x: max(x, max_size))
-
-            gen += 1
-            history.append(grid_cpy.copy())
-            grid_cpy = GameOfLife(grid_cpy).run()
-
-        fitness += gen * 0.8 + max_size * 0.2
+        fitness, gen, max_size = simulation.fitness, simulation.gen, simulation.max_size
+        GeneticAlgorithmStatistics.set_stat("max_size", lambda x: max(x, max_size))
         GeneticAlgorithmStatistics.set_stat("max_fitness", lambda x: max(x, fitness))
         GeneticAlgorithmStatistics.set_stat("max_gen", lambda x: max(x, gen))
+        return fitness
+
+    @staticmethod
+    def calculate(bits: int):
+        return GridFitnessCalculator.evaluate(bits, Config.MAX_ITERATIONS)
+
+
+class SuccessiveHalvingEvaluator:
+    """
+    A class used to evaluate a population with multi-fidelity successive halving.
+    Every candidate is first screened with the shortest horizon, then only the best keep_fraction
+    of the candidates that are still evolving is promoted to the next, longer horizon. Promoted
+    candidates resume their cached simulation instead of restarting it, and candidates that became
+    stable or oscillating already have their exact fitness and are never promoted.
+    Candidates still evolving at a rung have all lived exactly up to its horizon, so their fitness only
+    differs by peak population. They are ranked by their activity (the number of cells changing in the
+    next generation) first, which predicts a long remaining life better, and by fitness second.
+    Attributes
+    ----------
+    horizons : list
+        The increasing generation horizons of the rungs, the last one being the full budget.
+    keep_fraction : float
+        The fraction of the still evolving candidates promoted to the next rung.
+    Methods
+    -------
+    evaluate(population: List[int]) -> List[float]:
+        Returns the fitness of every candidate at the fidelity it was promoted to.
+    """
+    def __init__(self, horizons: List[int] = None, keep_fraction: float = 0.5):
+        self.horizons = horizons or [Config.MAX_ITERATIONS // 8, Config.MAX_ITERATIONS // 4, Config.MAX_ITERATIONS // 2, Config.MAX_ITERATIONS]
+        self.keep_fraction = keep_fraction
+
+    def evaluate(self, population: List[int]):
+        fitness = [0] * len(population)
+        survivors = list(range(len(population)))
+
+        for rung, horizon in enumerate(self.horizons):
+            for i in survivors:
+                fitness[i] = GridFitnessCalculator.evaluate(population[i], horizon)
+
+            if rung == len(self.horizons) - 1:
+                break
+
+            contenders = [i for i in survivors if not GridFitnessCalculator.simulation(population[i]).stable_or_oscillating]
+            contenders.sort(key=lambda i: (GridFitnessCalculator.simulation(population[i]).activity, fitness[i]), reverse=True)
+            survivors = contenders[:math.ceil(len(contenders) * self.keep_fraction)]
 
-        GridFitnessCalculator.cache[grid_hash] = (grid_cpy, fitness, gen, max_size, stable_or_oscillating)
         return fitness
 
 
@@ -84,49 +107,109 @@ class GridMutator:
         Mutates the given grid by either removing a random cell with a 50% probability
         or adding a random cell. Ensures the grid size does not exceed the maximum
         allowed cells.
+    mutate_packed(bits: int) -> int:
+        Applies the same mutation to a packed grid and returns the mutated packed grid.
+    mutate_batch(genomes: List[int], mutation_prob: float) -> List[int]:
+        Mutates each packed grid of the batch with the given probability.
     """
     @staticmethod
     def mutate(grid: Grid):
+        grid.grid = PackedGrid.to_grid(GridMutator.mutate_packed(PackedGrid.from_grid(grid))).grid
+
+    @staticmethod
+    def mutate_packed(bits: int):
+        if not bits:
+            return bits
+
+        # Walk the set bits up to a random one instead of materializing every cell
+        cells = PackedGrid.cells(bits)
+        for _ in range(random.randrange(PackedGrid.count(bits))):
+            next(cells)
+        center_x, center_y = next(cells)
+
         if random.random() < 0.5:
-            center_x, center_y = grid.get_random()
-            for dx, dy in random.choices(Grid.ALLOWED_DIRS):
-                grid.set_cell(center_x + dx, center_y + dy)
+            dx, dy = random.choice(Grid.ALLOWED_DIRS)
+            x, y = center_x + dx, center_y + dy
+            if 0 <= x < Config.MAX_GRID_SIZE and 0 <= y < Config.MAX_GRID_SIZE:
+                bits |= 1 << PackedGrid.index(x, y)
         else:  # Remove a random cell
-            random_cell = grid.get_random()
-            grid.set_cell(*random_cell, False)
+            bits &= ~(1 << PackedGrid.index(center_x, center_y))
 
+        return bits
+
+    @staticmethod
+    def mutate_batch(genomes: List[int], mutation_prob: float):
+        return [GridMutator.mutate_packed(bits) if random.random() < mutation_prob else bits for bits in genomes]
 
 
 class GridCrossover:
     """
     A class used to represent the crossover operation between two grids in a genetic algorithm.
+    All crossovers work on packed grids: a mask selects which cells the child inherits from
+    the second parent, every other cell is inherited from the first parent.
+    Methods
+    -------
+    crossover(grid1: Grid, grid2: Grid) -> Grid:
+        Produces a child by swapping a spatial block between the two parent grids.
+    crossover_batch(parents1: List[int], parents2: List[int], method: str = "uniform") -> List[int]:
+        Produces one child per pair of packed parents using the given crossover method
+        ("uniform", "block" or "single_point").
     """
     """
         Perform a crossover operation between two grids to produce a new grid.
-        The crossover operation involves selecting a random crossover point and combining cells
-        from both parent grids up to that point to create a new grid.
+        A rectangle spanned by two random alive cells of the parents is taken from the
+        second parent and the rest of the board is taken from the first parent.
         Parameters:
         grid1 (Grid): The first parent grid.
         grid2 (Grid): The second parent grid.
         Returns:
         Grid: A new grid resulting from the crossover of the two parent grids.
     """
-    
+    METHODS = ("uniform", "block", "single_point")
+
     @staticmethod
     def crossover(grid1: Grid, grid2: Grid):
-        new_grid = Grid()
-        cell_count = max(len(grid1), len(grid2))
-        crossover_points = random.sample(range(cell_count), k=2)
-        
-        for idx, cell in enumerate(grid1.grid):
-            if idx < crossover_points[0] or idx > crossover_points[1]:
-                new_grid.set_cell(*cell)
+        child = GridCrossover.crossover_batch([PackedGrid.from_grid(grid1)], [PackedGrid.from_grid(grid2)], "block")[0]
+        return PackedGrid.to_grid(child)
 
-        for idx, cell in enumerate(grid2.grid):
-            if crossover_points[0] <= idx <= crossover_points[1]:
-                new_grid.set_cell(*cell)
+    @staticmethod
+    def crossover_batch(parents1: List[int], parents2: List[int], method: str = "uniform"):
+        if method not in GridCrossover.METHODS:
+            raise ValueError(f"Unknown crossover method {method!r}, expected one of: {', '.join(GridCrossover.METHODS)}")
+
+        make_mask = getattr(GridCrossover, f"_{method}_mask")
+        children = []
+        for bits1, bits2 in zip(parents1, parents2):
+            mask = make_mask(bits1, bits2)
+            children.append((bits1 & ~mask) | (bits2 & mask))
+
+        return children
+
+    @staticmethod
+    def _uniform_mask(bits1: int, bits2: int):
+        board = PackedGrid.board_mask()
+        return random.getrandbits(board.bit_length()) & board
+
+    @staticmethod
+    def _block_mask(bits1: int, bits2: int):
+        union = bits1 | bits2
+        count = PackedGrid.count(union)
+        if count < 2:
+            return 0
+
+        picks = random.sample(range(count), k=2)
+        (x0, y0), (x1, y1) = [cell for idx, cell in enumerate(PackedGrid.cells(union)) if idx in picks]
+        return PackedGrid.region_mask(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+    @staticmethod
+    def _single_point_mask(bits1: int, bits2: int):
+        union = bits1 | bits2
+        if not union:
+            return 0
 
-        return new_grid
+        lowest = (union & -union).bit_length() - 1
+        crossover_point = random.randint(lowest, union.bit_length())
+        return (1 << crossover_point) - 1
 
     
 class GeneticAlgorithm:
@@ -139,62 +222,72 @@ class GeneticAlgorithm:
     population_size : int
         The number of individuals in the population.
     population : list
-        The current population of grid-based solutions.
+        The current population of packed grids.
     best_candidate : Grid
         The best candidate found during the algorithm's execution.
     best_fitness : float
         The fitness value of the best candidate.
-    best_fitness_history : set
-        A set to keep track of the best fitness values found in each generation.
+    offspring_size : int
+        The number of children bred (and weakest individuals replaced) every generation, 1 for a steady-state GA.
+    evaluator : SuccessiveHalvingEvaluator, optional
+        Evaluates the population with multi-fidelity successive halving instead of the full horizon.
     Methods
     -------
     _calculate_fitness():
         Calculates the fitness for all individuals in the population.
-    _select(fitness):
-        Selects two individuals from the population based on their fitness using roulette wheel selection.
+    _select(fitness, k):
+        Selects k individuals from the population based on their fitness using roulette wheel selection.
     _update_best_candidate(candidate, fitness):
         Updates the best candidate if the provided candidate has a higher fitness.
-    run():
+    run(on_generation=None):
         Runs the genetic algorithm for the specified number of iterations and returns the best candidate found.
+        on_generation, if given, is called after every generation with the generation number, the best
+        candidate, the best fitness and the average fitness of the population.
     """
-    def __init__(self, max_cells: int, max_iterations: int, population_size: int = 10):
+    def __init__(self, max_cells: int, max_iterations: int, population_size: int = 10, offspring_size: int = 1, evaluator: SuccessiveHalvingEvaluator = None):
         self.max_iterations = max_iterations
         self.population_size = population_size
-        self.population = [GridBuilder().build(max_cells) for _ in range(population_size)]
+        self.offspring_size = offspring_size
+        self.evaluator = evaluator
+        self.population = GridBuilder.build_batch(max_cells, population_size)
         self.best_candidate = None 
         self.best_fitness = float('-inf')
 
     def _calculate_fitness(self):
         # Calculate fitness for all individuals
+        if self.evaluator:
+            return self.evaluator.evaluate(self.population)
         return [GridFitnessCalculator.calculate(genom) for genom in self.population]
     
     # roulette wheel selection
-    def _select(self, fitness):
+    def _select(self, fitness, k=2):
         total_fitness = sum(fitness)
         probabilities = [f / total_fitness for f in fitness]
-        return random.choices(self.population, weights=probabilities, k=2)
+        return random.choices(self.population, weights=probabilities, k=k)
 
     def _update_best_candidate(self, candidate, fitness):
         if fitness > self.best_fitness:
             self.best_fitness = fitness
-            self.best_candidate = candidate
-            GeneticAlgorithmStatistics.set_stat("best_candidate", str(candidate.grid))
+            self.best_candidate = PackedGrid.to_grid(candidate)
+            GeneticAlgorithmStatistics.set_stat("best_candidate", str(self.best_candidate.grid))
 
-    def run(self):
+    def run(self, on_generation=None):
         mutation_prob = 0.01
         for gen in range(self.max_iterations):
             fitness = self._calculate_fitness()
             avg_fitness = sum(fitness) / len(fitness)
-            for i, grid in enumerate(self.population):
-                self._update_best_candidate(grid, fitness[i])
+            for i, genom in enumerate(self.population):
+                self._update_best_candidate(genom, fitness[i])
 
             print(f"gen: #{gen}: best candidate found with fitness: {self.best_fitness}")
             
             GeneticAlgorithmStatistics.add_sample("gen_sample", gen)
             GeneticAlgorithmStatistics.add_sample("fitness_sample", avg_fitness)
+            if on_generation:
+                on_generation(gen, self.best_candidate, self.best_fitness, avg_fitness)
             
-            parent1, parent2 = self._select(fitness)
-            child = GridCrossover.crossover(parent1, parent2)
+            parents = self._select(fitness, 2 * self.offspring_size)
+            children = GridCrossover.crossover_batch(parents[::2], parents[1::2], "block")
             
             print(abs(self.best_fitness - avg_fitness), self.best_fitness, avg_fitness)
             
@@ -203,12 +296,11 @@ class GeneticAlgorithm:
                 print("High selection pressure detected ! Increasing mutation rate")
                 mutation_prob = max(0.5, mutation_prob * 2)
             
-            if random.random() < mutation_prob:
-                GridMutator.mutate(child)
-                
-            self.population.append(child)
+            children = GridMutator.mutate_batch(children, mutation_prob)
+            self.population.extend(children)
 
-            weakest_index = fitness.index(min(fitness))
-            del self.population[weakest_index]
+            weakest_indices = sorted(range(len(fitness)), key=lambda i: fitness[i])[:self.offspring_size]
+            for weakest_index in sorted(weakest_indices, reverse=True):
+                del self.population[weakest_index]
 
         return self.best_candidate
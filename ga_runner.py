@@ -0,0 +1,92 @@
+import multiprocessing
+import queue
+import time
+from ga import GeneticAlgorithm, SuccessiveHalvingEvaluator
+from ga_statistics import GeneticAlgorithmStatistics
+
+
+class GeneticAlgorithmRunner:
+    """
+    A class to run the genetic algorithm in a background process and stream its progress.
+    The search process pushes small messages on a queue so that a UI can poll them from its
+    event loop without ever blocking on the search, and the search never waits on the UI.
+    Messages are dictionaries with a "type" key:
+        - "progress": the generation, the best candidate so far (as a grid string), its fitness,
+          the average fitness samples since the previous message and the throughput in candidates per second.
+        - "done": the final statistics of the run, in the format stored in configs.json.
+    Attributes:
+        PROGRESS_INTERVAL (float): The minimal number of seconds between two progress messages,
+            unless a better candidate was found.
+    Methods:
+        start():
+            Starts the search process.
+        stop():
+            Terminates the search process if it is still running.
+        is_alive():
+            Returns whether the search process is still running.
+        exitcode():
+            Returns the exit code of the search process, or None while it is running.
+        poll():
+            Returns the messages pushed by the search process since the last poll, without blocking.
+    """
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, max_cells: int, max_iterations: int, population_size: int, offspring_size: int):
+        self._queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=GeneticAlgorithmRunner._run,
+            args=(self._queue, max_cells, max_iterations, population_size, offspring_size),
+            daemon=True
+        )
+
+    def start(self):
+        self._process.start()
+
+    def stop(self):
+        if self._process.is_alive():
+            self._process.terminate()
+
+    def is_alive(self):
+        return self._process.is_alive()
+
+    def exitcode(self):
+        return self._process.exitcode
+
+    def poll(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+    @staticmethod
+    def _run(progress_queue, max_cells, max_iterations, population_size, offspring_size):
+        algo = GeneticAlgorithm(max_cells, max_iterations, population_size, offspring_size, SuccessiveHalvingEvaluator())
+
+        start_time = time.perf_counter()
+        progress = {"sent_at": 0, "best_fitness": float('-inf'), "fitness_samples": []}
+
+        def send_progress(gen, best_candidate, best_fitness):
+            now = time.perf_counter()
+            progress_queue.put({
+                "type": "progress",
+                "gen": gen,
+                "best_candidate": str(best_candidate.grid),
+                "best_fitness": best_fitness,
+                "fitness_samples": progress["fitness_samples"],
+                "throughput": (population_size + gen * offspring_size) / (now - start_time),
+            })
+            progress.update(sent_at=now, best_fitness=best_fitness, fitness_samples=[])
+
+        def on_generation(gen, best_candidate, best_fitness, avg_fitness):
+            progress["fitness_samples"].append((gen, avg_fitness))
+            if best_fitness > progress["best_fitness"] or time.perf_counter() - progress["sent_at"] >= GeneticAlgorithmRunner.PROGRESS_INTERVAL:
+                send_progress(gen, best_candidate, best_fitness)
+
+        algo.run(on_generation)
+
+        # Flush the samples of the last generations before reporting the end of the run
+        if progress["fitness_samples"]:
+            send_progress(max_iterations - 1, algo.best_candidate, algo.best_fitness)
+        progress_queue.put({"type": "done", "statistics": GeneticAlgorithmStatistics.get_stats()})
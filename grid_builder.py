@@ -1,6 +1,7 @@
 import random
 from config import Config
 from grid import Grid
+from packed_grid import PackedGrid
 
 class GridBuilder:
     """
@@ -9,6 +10,8 @@ class GridBuilder:
     -------
     build(num_cells: int) -> Grid
         Static method that constructs a grid with the specified number of cells.
+    build_batch(num_cells: int, count: int) -> List[int]
+        Static method that constructs a whole population of packed grids in one call.
     """
     """
         Constructs a grid with the specified number of cells.
@@ -23,11 +26,24 @@ class GridBuilder:
     """
     @staticmethod
     def build(num_cells: int) -> Grid:
-        grid = Grid()
-        
-        radius = 5
-        while grid.count_set() < num_cells:
-            random_x, random_y = random.randint(Config.MAX_GRID_SIZE // 2 - radius, Config.MAX_GRID_SIZE // 2 + radius), random.randint(Config.MAX_GRID_SIZE // 2 - radius, Config.MAX_GRID_SIZE // 2 + radius)
-            grid.set_cell(random_x, random_y)
-        
-        return grid
\ No newline at end of file
+        return PackedGrid.to_grid(GridBuilder.build_batch(num_cells, 1)[0])
+
+    @staticmethod
+    def build_batch(num_cells: int, count: int, radius: int = 5):
+        # Sample distinct cells around the center instead of rejection sampling them one by one
+        center = Config.MAX_GRID_SIZE // 2
+        indices = [
+            PackedGrid.index(x, y)
+            for y in range(max(center - radius, 0), min(center + radius, Config.MAX_GRID_SIZE - 1) + 1)
+            for x in range(max(center - radius, 0), min(center + radius, Config.MAX_GRID_SIZE - 1) + 1)
+        ]
+        num_cells = min(num_cells, len(indices))
+
+        population = []
+        for _ in range(count):
+            bits = 0
+            for idx in random.sample(indices, num_cells):
+                bits |= 1 << idx
+            population.append(bits)
+
+        return population
@@ -0,0 +1,65 @@
+from config import Config
+from packed_grid import PackedGrid
+
+
+class LifespanSimulation:
+    """
+    A class to simulate a packed grid until it becomes stable or oscillating, in resumable chunks.
+    The simulation keeps its partial state (current board, seen boards, generation and max size)
+    so that a candidate screened with a short horizon can later be advanced to a longer horizon
+    without restarting from the initial configuration.
+    Attributes
+    ----------
+    bits : int
+        The current packed board.
+    gen : int
+        The number of generations simulated so far.
+    max_size : int
+        The maximum number of alive cells seen so far.
+    stable_or_oscillating : bool
+        Whether the board repeated a previous state, in which case gen and max_size are final.
+    Methods
+    -------
+    advance(horizon: int):
+        Simulates until the board repeats a previous state or gen reaches the horizon.
+    fitness -> float:
+        The fitness of the candidate given the generations simulated so far.
+    activity -> int:
+        The number of cells of the current board that change in the next generation.
+    """
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.gen = 0
+        self.max_size = 0
+        self.stable_or_oscillating = False
+        self._seen = set()
+
+    @property
+    def fitness(self):
+        return 1 + self.gen * 0.8 + self.max_size * 0.2
+
+    @property
+    def activity(self):
+        return PackedGrid.count(self.bits ^ PackedGrid.step(self.bits))
+
+    def advance(self, horizon: int):
+        # Simulations are never advanced past Config.MAX_ITERATIONS, so their history is dropped there
+        if self.stable_or_oscillating or self._seen is None:
+            return
+
+        bits, gen, max_size, seen = self.bits, self.gen, self.max_size, self._seen
+        while gen < horizon:
+            # The initial board is only compared against once two generations have been simulated
+            if gen >= 2 and bits in seen:
+                self.stable_or_oscillating = True
+                break
+
+            max_size = max(max_size, PackedGrid.count(bits))
+            gen += 1
+            seen.add(bits)
+            bits = PackedGrid.step(bits)
+
+        self.bits, self.gen, self.max_size = bits, gen, max_size
+        if self.stable_or_oscillating or gen >= Config.MAX_ITERATIONS:
+            # The history is only needed to resume the simulation
+            self._seen = None
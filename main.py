@@ -1,30 +1,14 @@
 import tkinter as tk
 import sys
-from ga import GeneticAlgorithm
+from ga_runner import GeneticAlgorithmRunner
 from config import Config
 from ui import UI
-from ga_statistics import GeneticAlgorithmStatistics
 from json_serde import JsonSerde
 from grid import Grid
-import matplotlib.pyplot as plt
 
 def print_usage():
     print("Usage: python main.py [--load-configs | --run-ga]")
 
-def plot_statistics_history(samples):
-    generations = samples["gen_sample"]
-    fitness = samples["fitness_sample"]
-
-    plt.figure(dpi=150)
-    plt.plot(generations, fitness, linestyle='-', linewidth=1, label="Fitness")
-    
-    plt.title("Genetic Algorithm Fitness Over Generations")
-    plt.xlabel("Generation")
-    plt.ylabel("Average Fitness")
-    plt.grid()
-    plt.legend()
-    plt.show()
-
 def handle_load_configs():
     serde = JsonSerde("configs.json")
     objs = serde.deserialize()
@@ -44,19 +28,14 @@ def handle_load_configs():
     root.mainloop()    
 
 def handle_run_ga():
-    # Run genetic algorithm
-    algo = GeneticAlgorithm(Config.MAX_CELLS, 250, 50)
-    sparse_grid = algo.run()
+    # Run genetic algorithm in the background and display its progress live
+    runner = GeneticAlgorithmRunner(Config.MAX_CELLS, 250, 50, Config.OFFSPRING_SIZE)
+    runner.start()
 
-    # Save statistics
-    statistics = GeneticAlgorithmStatistics.get_stats()
+    # Save statistics once the run is done
     serde = JsonSerde("configs.json")
-    serde.serialize(statistics)
-    
-    # store the statistics about the current run of the ga in the expected format
-    configs = [statistics]
     root = tk.Tk()
-    UI(root, sparse_grid, configs=configs)
+    UI(root, Grid(), runner=runner, on_finished=serde.serialize)
     root.mainloop()
 
 def main():
@@ -66,7 +45,6 @@ def main():
     # This option runs the genetic algorithm to find the best configurations and stores the in the file
     elif len(sys.argv) > 1 and sys.argv[1] == "--run-ga":
         handle_run_ga()
-        plot_statistics_history(GeneticAlgorithmStatistics.get_samples())
     else:
         print_usage()
 
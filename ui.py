@@ -1,4 +1,6 @@
 import tkinter as tk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from grid import Grid
 from game_of_life import GameOfLife
 from config import Config
@@ -15,6 +17,10 @@ class UI:
         The initial grid state for the Game of Life.
     configs : list, optional
         A list of configurations for different grid states (default is None).
+    runner : GeneticAlgorithmRunner, optional
+        A running genetic algorithm whose progress is displayed live (default is None).
+    on_finished : callable, optional
+        Called with the final statistics once the runner is done (default is None).
     cell_size : int
         The size of each cell in the grid (default is 10).
     current_config_index : int
@@ -33,8 +39,13 @@ class UI:
         The label to display additional information about the current configuration.
     simulation_running : bool
         A flag to indicate whether the simulation is running (default is False).
+    stopped_by_user : bool
+        A flag to indicate whether the user stopped the simulation, in which case new champions
+        don't restart it (default is False).
     iteration : int
         The current iteration of the simulation (default is 0).
+    fitness_line : matplotlib.lines.Line2D
+        The live average fitness chart (only when a runner is given).
     Methods:
     --------
     update_canvas():
@@ -55,8 +66,19 @@ class UI:
         Displays the next configuration from the configs list.
     load_current_config():
         Loads the current configuration and resets the grid and simulation state.
+    create_fitness_chart():
+        Embeds the live average fitness chart below the grid.
+    poll_runner():
+        Applies the progress messages of the runner and reschedules itself until the run is done
+        or the search process exited without finishing.
+    show_champion(grid: Grid):
+        Replaces the animated grid by a new best candidate, starting the simulation unless the user stopped it.
+    close():
+        Stops the runner and destroys the window.
     """
-    def __init__(self, master, grid: Grid, configs=None):
+    POLL_INTERVAL = 100
+
+    def __init__(self, master, grid: Grid, configs=None, runner=None, on_finished=None):
         self.master = master
         self.master.title("Game of Life")
         self.initial_grid = grid
@@ -64,6 +86,8 @@ class UI:
         self.cell_size = 10
         self.configs = configs or []
         self.current_config_index = 0
+        self.runner = runner
+        self.on_finished = on_finished
 
         # Create canvas with background color
         self.canvas = tk.Canvas(
@@ -93,10 +117,18 @@ class UI:
         self.info_label.pack()
 
         self.simulation_running = False
+        self.stopped_by_user = False
         self.iteration = 0
 
+        if self.runner:
+            self.create_fitness_chart()
+            self.info_label.config(text="Waiting for the first generation...")
+            self.master.protocol("WM_DELETE_WINDOW", self.close)
+            self.master.after(self.POLL_INTERVAL, self.poll_runner)
+        else:
+            self.update_info()
+
         self.update_canvas()
-        self.update_info()
 
     def update_canvas(self):
         self.canvas.delete("all")
@@ -128,16 +160,19 @@ class UI:
     def toggle_simulation(self):
         if self.simulation_running:
             self.simulation_running = False
+            self.stopped_by_user = True
             self.start_stop_button.config(text="Start")
             self.master.title(f"Game of Life - Stopped at Iteration {self.iteration}")
         else:
             self.simulation_running = True
+            self.stopped_by_user = False
             self.start_stop_button.config(text="Stop")
             self.run_game_of_life()
 
     def rewind_simulation(self):
         # Reset the grid to its initial state and update the canvas
         self.simulation_running = False
+        self.stopped_by_user = True
         self.iteration = 0
         self.grid = self.initial_grid
         self.update_canvas()
@@ -175,3 +210,71 @@ class UI:
         self.iteration = 0
         self.start_stop_button.config(text="Start")
         self.master.title(f"Game of Life - Config {self.current_config_index + 1}")
+
+    def create_fitness_chart(self):
+        figure = Figure(figsize=(5, 2.5), dpi=100)
+        axes = figure.add_subplot()
+        axes.set_title("Genetic Algorithm Fitness Over Generations")
+        axes.set_xlabel("Generation")
+        axes.set_ylabel("Average Fitness")
+        axes.grid()
+        self.fitness_line, = axes.plot([], [], linestyle='-', linewidth=1, label="Fitness")
+        axes.legend()
+        figure.tight_layout()
+
+        self.chart = FigureCanvasTkAgg(figure, master=self.master)
+        self.chart.get_tk_widget().pack()
+
+    def poll_runner(self):
+        # Only drain what the search already produced, the event loop never waits on the search.
+        # The liveness is checked first so every message sent before the process exited gets drained.
+        alive = self.runner.is_alive()
+        samples = []
+        progress = None
+        statistics = None
+        for message in self.runner.poll():
+            if message["type"] == "progress":
+                samples.extend(message["fitness_samples"])
+                progress = message
+            elif message["type"] == "done":
+                statistics = message["statistics"]
+
+        if progress:
+            if progress["best_candidate"] != str(self.initial_grid.grid):
+                self.show_champion(Grid.from_string(progress["best_candidate"]))
+            self.info_label.config(
+                text=f"Gen: {progress['gen']}, "
+                     f"Best Fitness: {progress['best_fitness']:.1f}, "
+                     f"Throughput: {progress['throughput']:.0f} candidates/s"
+            )
+
+        if samples:
+            gens, fitness = self.fitness_line.get_data()
+            self.fitness_line.set_data(list(gens) + [gen for gen, _ in samples], list(fitness) + [f for _, f in samples])
+            self.fitness_line.axes.relim()
+            self.fitness_line.axes.autoscale_view()
+            self.chart.draw_idle()
+
+        if statistics is None:
+            if alive:
+                self.master.after(self.POLL_INTERVAL, self.poll_runner)
+            else:
+                self.info_label.config(text=f"The search stopped unexpectedly (exit code {self.runner.exitcode()}), no statistics were saved.")
+            return
+
+        self.configs = [{**statistics, "grid": self.initial_grid}]
+        self.update_info()
+        if self.on_finished:
+            self.on_finished(statistics)
+
+    def show_champion(self, grid: Grid):
+        self.initial_grid = grid
+        self.grid = grid
+        self.iteration = 0
+        self.update_canvas()
+        if not self.simulation_running and not self.stopped_by_user:
+            self.toggle_simulation()
+
+    def close(self):
+        self.runner.stop()
+        self.master.destroy()